@@ -0,0 +1,26 @@
+# Production server settings: gunicorn --config gunicorn.conf.py app:app
+import multiprocessing
+from os import environ
+
+bind = '0.0.0.0:' + environ.get('PORT', '4000')
+workers = int(environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+threads = int(environ.get('GUNICORN_THREADS', 1))
+timeout = int(environ.get('GUNICORN_TIMEOUT', 120))
+max_requests = int(environ.get('GUNICORN_MAX_REQUESTS', 0)) # 0 never recycles a worker
+max_requests_jitter = max_requests // 10
+
+# Import the app once in the master; the workers forked from it share matplotlib, NumPy,
+# SciPy and the font cache copy-on-write instead of importing them each (APP_MODE=crud
+# imports none of them)
+preload_app = True
+
+def when_ready(server):
+    # master, after the app is loaded and before the first fork
+    import app
+    app.warmUp() # the PDF backend and font cache get loaded here, once, for every worker
+    app.disposeEngines() # connections opened while loading must not be inherited
+
+def post_worker_init(worker):
+    # every worker renders one throwaway piece before it accepts requests
+    import app
+    app.warmUp()
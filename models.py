@@ -0,0 +1,532 @@
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.orm import deferred, relationship, scoped_session, sessionmaker, Session
+from os import environ
+from bisect import bisect_right
+from itertools import chain
+from datetime import datetime
+import math
+import threading
+import time
+
+# Setup
+#region
+def engineOptions():
+    # pool settings from the environment; unset ones keep SQLAlchemy's defaults for the driver
+    options = {'pool_pre_ping': environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true'}
+    for name, option, cast in (('DB_POOL_SIZE', 'pool_size', int), ('DB_MAX_OVERFLOW', 'max_overflow', int),
+                               ('DB_POOL_RECYCLE', 'pool_recycle', int), ('DB_POOL_TIMEOUT', 'pool_timeout', float)):
+        if environ.get(name):
+            options[option] = cast(environ[name])
+    return options
+
+# bound to the Flask app by app.py; nothing here imports Flask routes or the drafting stack
+db = SQLAlchemy()
+
+# GETs and drafting read through readQuery, which uses DB_READ_URL (a replica) when it is set
+readEngine = create_engine(environ['DB_READ_URL'], **engineOptions()) if environ.get('DB_READ_URL') else None
+readSession = scoped_session(sessionmaker(bind=readEngine)) if readEngine is not None else None
+
+def readQuery(*entities):
+    return (readSession if readSession is not None else db.session).query(*entities)
+
+BATCH_QUERY_ROWS = 100
+
+def isNumber(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+#endregion
+
+# DB Models
+#region
+class Continent(db.Model):
+    __tablename__ = 'continent'
+
+    code = db.Column(db.String(2), primary_key=True)
+    name = db.Column(db.String(255), nullable=False)
+    
+    child = relationship('Country', back_populates='parent')
+
+    def json(self):
+        return {
+            'code': self.code,
+            'name': self.name
+        }
+    
+class Country(db.Model):
+    __tablename__ = 'country'
+
+    code = db.Column(db.String(2), primary_key=True)
+    continent_code = db.Column(db.String(2), db.ForeignKey('continent.code'), nullable=False)
+    name = db.Column(db.String(255), nullable=False)
+    iso3 = db.Column(db.String(3), nullable=True)
+    number = db.Column(db.String(3), nullable=True)
+    full_name = db.Column(db.String(255), nullable=False)
+
+    parent = relationship('Continent', back_populates='child')
+    child = relationship('Person', back_populates='parent')
+
+    def json(self):
+        return {
+            'code': self.code,
+            'name': self.name,
+            'continent_code': self.continent_code,
+            'iso3': self.iso3,
+            'number': self.number,
+            'full_name': self.full_name
+        }
+    
+class Person(db.Model):
+    __tablename__ = 'person'
+
+    id = db.Column(db.Integer, primary_key=True)
+    birth_year = db.Column(db.Integer, nullable=False)
+    is_male = db.Column(db.Boolean, nullable=False)
+    is_metric = db.Column(db.Boolean, nullable=False)
+    height = db.Column(db.Float)
+    weight = db.Column(db.Float)
+    email = db.Column(db.String(64), unique=True, nullable=False)
+    country_code = db.Column(db.String(2), db.ForeignKey('country.code'), nullable=False, index=True)
+    
+    parent = relationship('Country', back_populates='child')
+    child1 = relationship('BodyMeasurements', back_populates='parent', cascade='all, delete-orphan')
+    child2 = relationship('PatternPoints', back_populates='parent', cascade='all, delete-orphan')
+
+    def json(self):
+        return {
+            'id': self.id,
+            'birth_year': self.birth_year,
+            'is_male': self.is_male,
+            'is_metric': self.is_metric,
+            'height': self.height,
+            'weight': self.weight,
+            'email': self.email,
+            'country_code': self.country_code
+        }
+    
+class BodyMeasurements(db.Model):
+    __tablename__ = 'body_measurements'
+
+    id = db.Column(db.Integer, primary_key=True)
+    person_id = db.Column(db.Integer, db.ForeignKey('person.id'), unique=True, nullable=False)
+    neck = db.Column(db.Float)
+    bust = db.Column(db.Float)
+    chest = db.Column(db.Float)
+    waist = db.Column(db.Float)
+    abdomen = db.Column(db.Float)
+    hip = db.Column(db.Float)
+    center_length_front = db.Column(db.Float)
+    center_length_back = db.Column(db.Float)
+    full_length_front = db.Column(db.Float)
+    full_length_back = db.Column(db.Float)
+    shoulder_slope_front = db.Column(db.Float)
+    shoulder_slope_back = db.Column(db.Float)
+    new_strap = db.Column(db.Float)
+    bust_depth = db.Column(db.Float)
+    bust_radius = db.Column(db.Float)
+    bust_span = db.Column(db.Float)
+    side_length = db.Column(db.Float)
+    neck_front = db.Column(db.Float)
+    neck_back = db.Column(db.Float)
+    shoulder_length = db.Column(db.Float)
+    across_shoulder_front = db.Column(db.Float)
+    across_shoulder_back = db.Column(db.Float)
+    across_front = db.Column(db.Float)
+    across_back = db.Column(db.Float)
+    bust_arc = db.Column(db.Float)
+    back_arc = db.Column(db.Float)
+    waist_arc_front = db.Column(db.Float)
+    waist_arc_back = db.Column(db.Float)
+    abdomen_arc_front = db.Column(db.Float)
+    abdomen_arc_back = db.Column(db.Float)
+    hip_arc_front = db.Column(db.Float)
+    hip_arc_back = db.Column(db.Float)
+    hip_depth_front = db.Column(db.Float)
+    hip_depth_side = db.Column(db.Float)
+    hip_depth_back = db.Column(db.Float)
+    knee_length = db.Column(db.Float)
+    ankle_length = db.Column(db.Float)
+    inseam = db.Column(db.Float)
+    floor_length = db.Column(db.Float)
+    crotch_length = db.Column(db.Float)
+    crotch_depth = db.Column(db.Float)
+    arm_length = db.Column(db.Float)
+    elbow_length = db.Column(db.Float)
+    cap_height = db.Column(db.Float)
+    bicep = db.Column(db.Float)
+    wrist = db.Column(db.Float)
+    hand = db.Column(db.Float)
+    thigh = db.Column(db.Float)
+    knee = db.Column(db.Float)
+    calf = db.Column(db.Float)
+    ankle = db.Column(db.Float)
+    
+    parent = relationship('Person', back_populates='child1')
+
+    def json(self):
+        return {
+            'id': self.id,
+            'person_id': self.person_id,
+            'neck': self.neck,
+            'bust': self.bust,
+            'chest': self.chest,
+            'waist': self.waist,
+            'abdomen': self.abdomen,
+            'center_length_front': self.center_length_front,
+            'center_length_back': self.center_length_back,
+            'full_length_front': self.full_length_front,
+            'full_length_back': self.full_length_back,
+            'shoulder_slope_front': self.shoulder_slope_front,
+            'shoulder_slope_back': self.shoulder_slope_back,
+            'new_strap': self.new_strap,
+            'bust_depth': self.bust_depth,
+            'bust_radius': self.bust_radius,
+            'bust_span': self.bust_span,
+            'side_length': self.side_length,
+            'neck_front': self.neck_front,
+            'neck_back': self.neck_back,
+            'shoulder_length': self.shoulder_length,
+            'across_shoulder_front': self.across_shoulder_front,
+            'across_shoulder_back': self.across_shoulder_back,
+            'across_front': self.across_front,
+            'across_back': self.across_back,
+            'bust_arc': self.bust_arc,
+            'back_arc': self.back_arc,
+            'waist_arc_front': self.waist_arc_front,
+            'waist_arc_back': self.waist_arc_back,
+            'abdomen_arc_front': self.abdomen_arc_front,
+            'abdomen_arc_back': self.abdomen_arc_back,
+            'hip_arc_front': self.hip_arc_front,
+            'hip_arc_back': self.hip_arc_back,
+            'hip_depth_front': self.hip_depth_front,
+            'hip_depth_side': self.hip_depth_side,
+            'hip_depth_back': self.hip_depth_back,
+            'knee_length': self.knee_length,
+            'ankle_length': self.ankle_length,
+            'inseam': self.inseam,
+            'floor_length': self.floor_length,
+            'crotch_length': self.crotch_length,
+            'crotch_depth': self.crotch_depth,
+            'arm_length': self.arm_length,
+            'elbow_length': self.elbow_length,
+            'cap_height': self.cap_height,
+            'bicep': self.bicep,
+            'wrist': self.wrist,
+            'hand': self.hand,
+            'thigh': self.thigh,    
+            'knee': self.knee,
+            'calf': self.calf,
+            'ankle': self.ankle
+        }
+    
+class PatternPoints(db.Model):
+    __tablename__ = 'pattern_points'
+
+    id = db.Column(db.Integer, primary_key=True)
+    person_id = db.Column(db.Integer, db.ForeignKey('person.id'), unique=True, nullable=False)
+    center_front_neck_x = db.Column(db.Float)
+    center_front_neck_y = db.Column(db.Float)
+    center_back_neck_x = db.Column(db.Float)
+    center_back_neck_y = db.Column(db.Float)
+    center_front_waist_x = db.Column(db.Float)
+    center_front_waist_y = db.Column(db.Float)
+    center_back_waist_x = db.Column(db.Float)
+    center_back_waist_y = db.Column(db.Float)
+    high_shoulder_x = db.Column(db.Float)
+    high_shoulder_y = db.Column(db.Float)
+    shoulder_tip_x = db.Column(db.Float)
+    shoulder_tip_y = db.Column(db.Float)
+    side_waist_x = db.Column(db.Float)
+    side_waist_y = db.Column(db.Float)
+    bust_point_x = db.Column(db.Float)
+    bust_point_y = db.Column(db.Float)
+    sternum_x = db.Column(db.Float)
+    sternum_y = db.Column(db.Float)
+    side_abdomen_x = db.Column(db.Float)
+    side_abdomen_y = db.Column(db.Float)
+    side_hip_x = db.Column(db.Float)
+    side_hip_y = db.Column(db.Float)
+    below_armpit_x = db.Column(db.Float)
+    below_armpit_y = db.Column(db.Float)
+    front_axillary_fold_x = db.Column(db.Float)
+    front_axillary_fold_y = db.Column(db.Float)
+    back_axillary_fold_x = db.Column(db.Float)
+    back_axillary_fold_y = db.Column(db.Float)
+    
+    parent = relationship('Person', back_populates='child2')
+
+    def json(self):
+        return {
+            'id': self.id,
+            'person_id': self.person_id,
+            'center_front_neck_x': self.center_front_neck_x,
+            'center_front_neck_y': self.center_front_neck_y,
+            'center_back_neck_x': self.center_back_neck_x,
+            'center_back_neck_y': self.center_back_neck_y,
+            'center_front_waist_x': self.center_front_waist_x,
+            'center_front_waist_y': self.center_front_waist_y,
+            'center_back_waist_x': self.center_back_waist_x,
+            'center_back_waist_y': self.center_back_waist_y,
+            'high_shoulder_x': self.high_shoulder_x,
+            'high_shoulder_y': self.high_shoulder_y,
+            'shoulder_tip_x': self.shoulder_tip_x,
+            'shoulder_tip_y': self.shoulder_tip_y,
+            'side_waist_x': self.side_waist_x,
+            'side_waist_y': self.side_waist_y,
+            'bust_point_x': self.bust_point_x,
+            'bust_point_y': self.bust_point_y,
+            'sternum_x': self.sternum_x,
+            'sternum_y': self.sternum_y,
+            'side_abdomen_x': self.side_abdomen_x,
+            'side_abdomen_y': self.side_abdomen_y,
+            'side_hip_x': self.side_hip_x,
+            'side_hip_y': self.side_hip_y,
+            'below_armpit_x': self.below_armpit_x,
+            'below_armpit_y': self.below_armpit_y,
+            'front_axillary_fold_x': self.front_axillary_fold_x,
+            'front_axillary_fold_y': self.front_axillary_fold_y,
+            'back_axillary_fold_x': self.back_axillary_fold_x,
+            'back_axillary_fold_y': self.back_axillary_fold_y
+        }
+    
+class Sizes(db.Model):
+    __tablename__ = 'sizes'
+    # the size lookup index is rebuilt from one scan in this order
+    __table_args__ = (db.Index('ix_sizes_origin_measurement_min', 'origin_name', 'body_measurement', 'min_value'),
+                      # a unique index rather than a constraint, so a migration can add it to an existing table
+                      db.Index('uq_sizes_origin_symbol_measurement', 'origin_name', 'size_symbol', 'body_measurement',
+                               unique=True))
+
+    id = db.Column(db.Integer, primary_key=True)
+    origin_name = db.Column(db.String(32), nullable=False)
+    description = db.Column(db.String(128), nullable=False)
+    size_symbol = db.Column(db.String(8))
+    body_measurement = db.Column(db.String(32))
+    min_value = db.Column(db.Float)
+    max_value = db.Column(db.Float)
+    source_url = db.Column(db.String(256))
+
+    def json(self):
+        return {
+            'id': self.id,
+            'origin_name': self.origin_name,
+            'description': self.description,
+            'size_symbol': self.size_symbol,
+            'body_measurement': self.body_measurement,
+            'min_value': self.min_value,
+            'max_value': self.max_value,
+            'source_url': self.source_url
+        }
+
+class DraftJob(db.Model):
+    # shared by every web worker: a job accepted by one can be polled and fetched through any other
+    __tablename__ = 'draft_jobs'
+
+    id = db.Column(db.String(32), primary_key=True)
+    status = db.Column(db.String(8), nullable=False) # queued, running, done or failed
+    piece = db.Column(db.String(64), nullable=False)
+    person_id = db.Column(db.Integer, nullable=False)
+    renderer = db.Column(db.String(16), nullable=False)
+    format = db.Column(db.String(8), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False)
+    started_at = db.Column(db.DateTime) # when a worker last claimed it; the lease runs from here
+    finished_at = db.Column(db.DateTime, index=True)
+    error = db.Column(db.String(128))
+    data = deferred(db.Column(db.LargeBinary)) # the drafted file, loaded only by the result route
+
+    def json(self):
+        result = {
+            'id': self.id,
+            'status': self.status,
+            'piece': self.piece,
+            'person_id': self.person_id,
+            'renderer': self.renderer,
+            'format': self.format,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at is not None else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at is not None else None,
+            'error': self.error
+        }
+        if self.status == 'done':
+            result['result_url'] = '/pattern/jobs/%s/result' % self.id
+        return result
+
+MEASUREMENT_COLUMNS = [column.name for column in BodyMeasurements.__table__.columns
+                       if column.name not in ('id', 'person_id')]
+PERSON_COLUMNS = [column.name for column in Person.__table__.columns if column.name != 'id']
+#endregion
+
+# Size lookup
+#region
+
+def sizeChart(rows):
+    # Sizes rows of one origin -> {size_symbol: {body_measurement: value}}, taking the middle of each range,
+    # or the one bound an open-ended range gives; measurements the drafts do not use are skipped
+    chart = {}
+    for row in rows:
+        bounds = [value for value in (row.min_value, row.max_value) if value is not None]
+        if row.size_symbol and row.body_measurement in MEASUREMENT_COLUMNS and bounds:
+            chart.setdefault(row.size_symbol, {})[row.body_measurement] = sum(bounds)/len(bounds)
+    return chart
+
+def sizeOrder(chart):
+    # smallest to largest by the measurements every size gives, e.g. XS S M L XL
+    shared = set.intersection(*[set(values) for values in chart.values()]) if chart else set()
+    return sorted(chart, key=lambda symbol: (sum(chart[symbol][column] for column in shared), symbol))
+
+SIZE_INDEX_TTL = float(environ.get('SIZE_INDEX_TTL', 300)) # seconds; catches Sizes written by other processes
+
+class SizeIndex:
+    # Interval index over Sizes: {origin: {measurement: (mins, maxes, symbols)}}, each sorted by
+    # min_value, so a lookup is one bisect per measurement. Built lazily and swapped in whole;
+    # commits that touch Sizes invalidate it, and it is rebuilt anyway once it is SIZE_INDEX_TTL old.
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.origins = None
+        self.built = 0
+
+    def invalidate(self):
+        self.origins = None
+
+    def current(self):
+        origins = self.origins
+        if origins is None or time.monotonic() - self.built > self.ttl:
+            with self.lock:
+                if self.origins is origins:
+                    self.origins = self.build()
+                    self.built = time.monotonic()
+                origins = self.origins
+        return origins
+
+    def build(self):
+        rows = (readQuery(Sizes.origin_name, Sizes.body_measurement, Sizes.min_value, Sizes.max_value,
+                          Sizes.size_symbol)
+                .filter(Sizes.body_measurement.in_(MEASUREMENT_COLUMNS), Sizes.size_symbol.isnot(None))
+                .order_by(Sizes.origin_name, Sizes.body_measurement, Sizes.min_value).all())
+        charts = {}
+        for row in rows:
+            charts.setdefault(row.origin_name, []).append(row)
+        origins = {}
+        for origin, chart in charts.items():
+            # a size's rank breaks ties between sizes matching the same number of measurements
+            rank = {symbol: index for index, symbol in enumerate(sizeOrder(sizeChart(chart)))}
+            intervals = {}
+            for row in chart:
+                low = -math.inf if row.min_value is None else row.min_value
+                high = math.inf if row.max_value is None else row.max_value
+                intervals.setdefault(row.body_measurement, []).append((low, high, row.size_symbol))
+            # re-sorted because databases disagree on where a null min_value goes
+            origins[origin] = ({measurement: tuple(zip(*sorted(values, key=lambda value: value[0])))
+                                for measurement, values in intervals.items()}, rank)
+        return origins
+
+    def lookup(self, bm, originName=None):
+        # per origin, the size each measurement falls in and the size most of them agree on
+        origins = self.current()
+        results = []
+        for origin in ([originName] if originName is not None else sorted(origins)):
+            if origin not in origins:
+                continue
+            intervals, rank = origins[origin]
+            matches = {}
+            for measurement, (lows, highs, symbols) in intervals.items():
+                value = getattr(bm, measurement)
+                if value is None:
+                    continue
+                index = bisect_right(lows, value) - 1
+                if index >= 0 and value <= highs[index]:
+                    matches[measurement] = symbols[index]
+            counts = {}
+            for symbol in matches.values():
+                counts[symbol] = counts.get(symbol, 0) + 1
+            best = max(counts, key=lambda symbol: (counts[symbol], rank.get(symbol, -1)), default=None)
+            results.append({'origin_name': origin, 'size_symbol': best, 'matched': counts.get(best, 0),
+                            'measurements': matches})
+        return results
+
+sizeIndex = SizeIndex(SIZE_INDEX_TTL)
+
+@event.listens_for(Session, 'before_flush')
+def noteSizeChanges(session, context, instances):
+    if any(isinstance(row, Sizes) for row in chain(session.new, session.dirty, session.deleted)):
+        session.info['sizes_changed'] = True
+
+@event.listens_for(Session, 'after_commit')
+def refreshSizeIndex(session):
+    if session.info.pop('sizes_changed', False):
+        sizeIndex.invalidate()
+
+@event.listens_for(Session, 'after_rollback')
+def forgetSizeChanges(session):
+    session.info.pop('sizes_changed', None)
+
+#endregion
+
+# Schema migrations
+#region
+
+MIGRATION_LOCK = 7240601 # PostgreSQL advisory lock key, so concurrent migrate commands take turns
+
+class SchemaVersion(db.Model):
+    __tablename__ = 'schema_version'
+
+    version = db.Column(db.Integer, primary_key=True)
+    description = db.Column(db.String(128), nullable=False)
+    applied_at = db.Column(db.DateTime, nullable=False)
+
+def createTables(connection):
+    # Creates any missing table as the models define it now, indexes included. A database made by
+    # db.create_all() before migrations existed keeps its tables, and the later steps bring it up
+    # to date, so every later step must also be a no-op where step 1 has already made its change.
+    db.metadata.create_all(connection, tables=[model.__table__ for model in
+                                               (Continent, Country, Person, BodyMeasurements, PatternPoints, Sizes)])
+
+def createIndex(connection, model, name):
+    if name not in {index['name'] for index in inspect(connection).get_indexes(model.__tablename__)}:
+        next(index for index in model.__table__.indexes if index.name == name).create(connection)
+
+def addColumn(connection, model, name):
+    if name not in {column['name'] for column in inspect(connection).get_columns(model.__tablename__)}:
+        column = model.__table__.c[name]
+        connection.execute(text('ALTER TABLE %s ADD COLUMN %s %s' % (model.__tablename__, name,
+                                                                     column.type.compile(connection.dialect))))
+
+def uniqueSizes(connection):
+    # rows loaded twice before the key was enforced; the last one loaded wins, as in load-reference
+    connection.execute(text("DELETE FROM sizes WHERE size_symbol IS NOT NULL AND body_measurement IS NOT NULL AND id "
+                            "NOT IN (SELECT max(id) FROM sizes GROUP BY origin_name, size_symbol, body_measurement)"))
+    createIndex(connection, Sizes, 'uq_sizes_origin_symbol_measurement')
+
+# (version, description, step), applied in order; append new steps, never edit applied ones
+MIGRATIONS = [
+    (1, 'continent, country, person, body_measurements, pattern_points and sizes tables', createTables),
+    (2, 'sizes lookup index', lambda connection: createIndex(connection, Sizes, 'ix_sizes_origin_measurement_min')),
+    (3, 'sizes reference key', uniqueSizes),
+    (4, 'person country index', lambda connection: createIndex(connection, Person, 'ix_person_country_code')),
+    (5, 'draft jobs table', lambda connection: DraftJob.__table__.create(connection, checkfirst=True)),
+    (6, 'draft job leases', lambda connection: addColumn(connection, DraftJob, 'started_at'))
+]
+
+def schemaVersion(connection):
+    # 0 for an empty database or one made before migrations existed
+    if not inspect(connection).has_table(SchemaVersion.__tablename__):
+        return 0
+    return connection.execute(text("SELECT max(version) FROM schema_version")).scalar() or 0
+
+def migrate(engine):
+    # each pending step runs in its own transaction along with its schema_version row
+    applied = []
+    for version, description, step in MIGRATIONS:
+        with engine.begin() as connection:
+            if connection.dialect.name == 'postgresql':
+                connection.execute(text("SELECT pg_advisory_xact_lock(%d)" % MIGRATION_LOCK))
+            if schemaVersion(connection) >= version:
+                continue
+            SchemaVersion.__table__.create(connection, checkfirst=True)
+            step(connection)
+            connection.execute(SchemaVersion.__table__.insert(),
+                               {'version': version, 'description': description, 'applied_at': datetime.utcnow()})
+            applied.append((version, description))
+    return applied
+
+#endregion
\ No newline at end of file
@@ -0,0 +1,55 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# one SQLite file for the session, so other processes can open the same database
+DB_PATH = os.path.join(tempfile.mkdtemp(), 'test.db')
+os.environ['DB_URL'] = 'sqlite:///' + DB_PATH
+os.environ.pop('DB_READ_URL', None)
+os.environ['APP_MODE'] = 'full'
+os.environ['JOB_POLL'] = '3600' # idle job workers would otherwise claim the rows a test sets up
+
+MENS_MEASUREMENTS = dict(neck=15, bust=40, chest=40, waist=34, abdomen=36, hip=40, center_length_front=15,
+                         center_length_back=18, full_length_front=18.5, full_length_back=18.5, shoulder_slope_front=19,
+                         shoulder_slope_back=19, new_strap=16, bust_depth=9, bust_radius=3, bust_span=4,
+                         side_length=8.5, neck_front=3, neck_back=3, shoulder_length=6.5, across_shoulder_front=8.5,
+                         across_shoulder_back=9, across_front=7, across_back=7.5, bust_arc=10, back_arc=10,
+                         waist_arc_front=8.5, waist_arc_back=8.5, abdomen_arc_front=9, abdomen_arc_back=9,
+                         hip_arc_front=10, hip_arc_back=10, hip_depth_front=8, hip_depth_side=8, hip_depth_back=8,
+                         knee_length=23, ankle_length=40, inseam=32, floor_length=42, crotch_length=26, crotch_depth=10,
+                         arm_length=25, elbow_length=11, cap_height=6, bicep=13, wrist=7, hand=8, thigh=22, knee=15,
+                         calf=15, ankle=9)
+WOMENS_MEASUREMENTS = dict(neck=14, bust=36, chest=34, waist=28, abdomen=32, hip=38, center_length_front=14.25,
+                           center_length_back=16.75, full_length_front=17.5, full_length_back=17.5,
+                           shoulder_slope_front=17.25, shoulder_slope_back=17.5, new_strap=16.5, bust_depth=9.5,
+                           bust_radius=3, bust_span=3.75, side_length=8.5, neck_front=3, neck_back=3,
+                           shoulder_length=5.25, across_shoulder_front=7.75, across_shoulder_back=8, across_front=6.75,
+                           across_back=7.25, bust_arc=9.5, back_arc=8.5, waist_arc_front=7.5, waist_arc_back=6.75,
+                           abdomen_arc_front=8.5, abdomen_arc_back=8, hip_arc_front=9.75, hip_arc_back=9.25,
+                           hip_depth_front=9, hip_depth_side=8.75, hip_depth_back=8.5, knee_length=23, ankle_length=38,
+                           inseam=30, floor_length=40, crotch_length=25, crotch_depth=10, arm_length=23,
+                           elbow_length=10, cap_height=6, bicep=11, wrist=6, hand=7, thigh=21, knee=14, calf=14,
+                           ankle=8.5)
+
+@pytest.fixture(scope='session')
+def app():
+    import app as appmodule
+    import models
+    with appmodule.app.app_context():
+        models.migrate(models.db.engine)
+        models.db.session.add(models.Continent(code='NA', name='North America'))
+        models.db.session.add(models.Country(code='US', continent_code='NA', name='US', full_name='United States'))
+        for personId, isMale, measurements in ((1, True, MENS_MEASUREMENTS), (2, False, WOMENS_MEASUREMENTS)):
+            models.db.session.add(models.Person(id=personId, birth_year=1990, is_male=isMale, is_metric=False,
+                                                email='person%d@example.com' % personId, country_code='US'))
+            models.db.session.add(models.BodyMeasurements(person_id=personId, **measurements))
+        models.db.session.commit()
+    return appmodule.app
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from conftest import MENS_MEASUREMENTS, WOMENS_MEASUREMENTS
+
+def measurementRows(count=40, seed=7):
+    # men's and women's test rows scaled by up to 10% per measurement; a few cannot be drafted
+    rng = np.random.default_rng(seed)
+    return [SimpleNamespace(**{name: value * rng.uniform(0.9, 1.1) for name, value in base.items()})
+            for base in (MENS_MEASUREMENTS, WOMENS_MEASUREMENTS) for _ in range(count)]
+
+def pointsFunctions():
+    import patterns
+    torso = [(front, sleeve) for front in (True, False) for sleeve in (True, False)]
+    return ([(patterns.mensTorsoPoints, args) for args in torso] + [(patterns.womensTorsoPoints, args) for args in torso]
+            + [(patterns.womensSkirtPoints, (front,)) for front in (True, False)])
+
+@pytest.mark.parametrize('pointsFunction, args', pointsFunctions(),
+                         ids=lambda value: value.__name__ if callable(value) else repr(value))
+def test_batch_matches_each_row_drafted_alone(pointsFunction, args):
+    import patterns
+    rows = measurementRows()
+    batch = patterns.draftBatch(pointsFunction, patterns.measurementMatrix(rows), *args)
+    undraftable = 0
+    for index, row in enumerate(rows):
+        try:
+            points = pointsFunction(row, *args)
+        except (ArithmeticError, ValueError):
+            # the batch marks the row with nan rather than raising
+            undraftable += 1
+            values = [batch[index]] if not isinstance(batch, dict) else [point[index] for point in batch.values()]
+            assert any(np.isnan(value).any() for value in values)
+            continue
+        if not isinstance(points, dict):
+            np.testing.assert_allclose(batch[index], points, rtol=0, atol=1e-14)
+            continue
+        assert set(points) == set(batch)
+        for name, point in points.items():
+            np.testing.assert_allclose(batch[name][index], np.asarray(point, dtype=float), rtol=0, atol=1e-14)
+    assert undraftable < len(rows) // 4
+
+@pytest.mark.parametrize('personIds', [[True], [1, False], [], [1.0], '1'])
+def test_batch_person_ids_must_be_integers(client, personIds):
+    response = client.post('/pattern/batch', json={'person_ids': personIds, 'pieces': ['mens/sloper/sleeve']})
+    assert response.status_code == 400
+
+def test_batch_person_ids_are_capped(client, monkeypatch):
+    import patterns
+    monkeypatch.setattr(patterns, 'BATCH_MAX_PEOPLE', 3)
+    request = {'pieces': ['mens/sloper/sleeve'], 'renderer': 'native', 'format': 'svg'}
+    assert client.post('/pattern/batch', json=dict(request, person_ids=[1, 2, 1])).status_code == 200
+    response = client.post('/pattern/batch', json=dict(request, person_ids=[1, 2, 1, 2]))
+    assert response.status_code == 400
+    assert response.get_json() == {'message': 'at most 3 person_ids per request'}
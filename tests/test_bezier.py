@@ -0,0 +1,81 @@
+import random
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from scipy.integrate import quad
+
+from conftest import MENS_MEASUREMENTS, WOMENS_MEASUREMENTS
+
+TOLERANCE = 1e-12 # relative, against quad run to 1e-13
+
+def quadLength(controls):
+    # the integral cubicBezierLen used to compute, with quad tightened well past its defaults
+    deltas = np.diff(np.asarray(controls, dtype=float), axis=0)
+    speed = lambda t: np.hypot(*(3 * (1 - t)**2 * deltas[0] + 6 * (1 - t) * t * deltas[1] + 3 * t**2 * deltas[2]))
+    return quad(speed, 0, 1, epsabs=1e-13, epsrel=1e-13, limit=500)[0]
+
+def measurementRows(count, spread, seed=6):
+    # the test rows, and rows with every measurement moved by up to spread either way
+    rng = random.Random(seed)
+    rows = [MENS_MEASUREMENTS, WOMENS_MEASUREMENTS]
+    for base in (MENS_MEASUREMENTS, WOMENS_MEASUREMENTS):
+        rows += [{name: value * rng.uniform(1 - spread, 1 + spread) for name, value in base.items()}
+                 for _ in range(count)]
+    return rows
+
+def draftedCurves(patterns, rows, monkeypatch):
+    # every control polygon cubicBezierLen measures while every piece is drafted, with the node it is for
+    curves = []
+    measure = patterns.cubicBezierLen
+    def record(*points):
+        curves.append((sys._getframe(1).f_code.co_name, np.array(points, dtype=float)))
+        return measure(*points)
+    monkeypatch.setattr(patterns, 'cubicBezierLen', record)
+    for row in rows:
+        context = patterns.DraftContext(SimpleNamespace(**row))
+        for piece in patterns.PATTERN_PIECES.values():
+            try:
+                context.get(piece.node)
+            except (ArithmeticError, ValueError):
+                pass
+    return curves
+
+@pytest.mark.parametrize('spread', [0.15, 0.3])
+def test_drafted_curves_match_quad(app, monkeypatch, spread):
+    import patterns
+    curves = draftedCurves(patterns, measurementRows(150, spread), monkeypatch)
+    measured = {name for name, (compute, _) in patterns.DRAFT_NODES.items()
+                if 'cubicBezierLen' in compute.__code__.co_names}
+    assert {name for name, _ in curves} == measured
+    controls = np.stack([points for _, points in curves])
+    expected = np.array([quadLength(points) for points in controls])
+    lengths = patterns.bezierLengths(controls)
+    assert np.max(np.abs(lengths - expected)/expected) < TOLERANCE
+    single = np.array([patterns.cubicBezierLen(*points) for points in controls])
+    assert np.max(np.abs(single - expected)/expected) < TOLERANCE
+
+def test_random_and_cusped_curves_match_quad(app):
+    import patterns
+    controls = np.concatenate([np.random.default_rng(3).uniform(-10, 10, (300, 4, 2)),
+                               [[[0, 0], [1, 1], [0, 1], [1, 0]], # cusp at t = 0.5
+                                [[0, 0], [3, 3], [-2, 3], [1, 0]], # cusp off the middle
+                                [[0, 0], [2, 0], [1, 0], [3, 0]], # a line that doubles back
+                                [[0, 0], [1, 0], [2, 0], [3, 0]]]])
+    expected = np.array([quadLength(points) for points in controls])
+    assert np.max(np.abs(patterns.bezierLengths(controls) - expected)/expected) < TOLERANCE
+
+def test_lengths_keep_the_batch_shape(app):
+    import patterns
+    controls = np.random.default_rng(4).uniform(-10, 10, (5, 3, 4, 2))
+    lengths = patterns.bezierLengths(controls)
+    assert lengths.shape == (5, 3)
+    assert lengths[2, 1] == pytest.approx(patterns.bezierLengths(controls[2, 1]), rel=1e-14)
+    # a batch row that cannot be drafted is nan, and does not hold up the rest
+    controls[1, 2, 0, 0] = np.nan
+    lengths = patterns.bezierLengths(controls)
+    assert np.isnan(lengths[1, 2]) and np.isfinite(np.delete(lengths.ravel(), 5)).all()
+    assert patterns.bezierLengths(np.zeros((4, 2))) == 0
+    points = [(np.array([0.0, 1.0]), np.array([0.0, 0.0])), (1.0, 1.0), (0.0, 1.0), (1.0, 0.0)]
+    assert patterns.cubicBezierLen(*points).shape == (2,)
@@ -0,0 +1,59 @@
+import json
+
+def person(email, country_code='US'):
+    return {'birth_year': 1990, 'is_male': True, 'is_metric': False, 'email': email, 'country_code': country_code}
+
+def ndjson(records):
+    return '\n'.join(record if isinstance(record, str) else json.dumps(record) for record in records)
+
+def test_only_the_first_errors_are_kept_and_every_one_is_counted(client, monkeypatch):
+    import app
+    monkeypatch.setattr(app, 'BULK_MAX_ERRORS', 3)
+    kept = []
+    keepError = app.keepError
+    def recordSize(errors, line, message):
+        keepError(errors, line, message)
+        kept.append(len(errors))
+    monkeypatch.setattr(app, 'keepError', recordSize)
+    lines = [person('bulk%d@example.com' % number) if number % 1000 == 0 else '{not json'
+             for number in range(1, 5001)]
+    response = client.post('/person/bulk', data=ndjson(lines), content_type='application/x-ndjson')
+    result = response.get_json()
+    assert response.status_code == 200
+    assert result['inserted'] == 5
+    assert result['failed'] == 4995
+    assert [error['line'] for error in result['errors']] == [1, 2, 3]
+    assert max(kept) == 3
+
+def test_errors_come_back_in_line_order(client, monkeypatch):
+    import app
+    monkeypatch.setattr(app, 'BULK_MAX_ERRORS', 3)
+    # line 1 is refused when its batch is inserted, after lines 2 and 4 already failed validation
+    lines = [person('order1@example.com', country_code='ZZ'), '[]', person('order3@example.com'), '{',
+             person('order5@example.com'), '7']
+    response = client.post('/person/bulk?batch_size=2', data=ndjson(lines), content_type='application/x-ndjson')
+    result = response.get_json()
+    assert result['inserted'] == 2
+    assert result['failed'] == 4
+    assert result['errors'] == [{'line': 1, 'message': 'country not found'},
+                                {'line': 2, 'message': 'expected a JSON object'},
+                                {'line': 4, 'message': 'invalid JSON'}]
+
+def test_batch_size_must_be_a_positive_integer(client):
+    for batchSize in ('abc', '1.5', '0', '-3'):
+        response = client.post('/person/bulk?batch_size=%s' % batchSize, data=ndjson([person('size@example.com')]),
+                               content_type='application/x-ndjson')
+        assert response.status_code == 400
+
+def test_batch_size_is_capped(client, monkeypatch):
+    import app
+    sizes = []
+    bulkIngest = app.bulkIngest
+    def recordBatchSize(stream, batchRows, validate, insert):
+        sizes.append(batchRows)
+        return bulkIngest(stream, batchRows, validate, insert)
+    monkeypatch.setattr(app, 'bulkIngest', recordBatchSize)
+    response = client.post('/person/bulk?batch_size=%d' % (app.BULK_MAX_BATCH_ROWS + 1),
+                           data=ndjson([person('capped@example.com')]), content_type='application/x-ndjson')
+    assert response.status_code == 200
+    assert sizes == [app.BULK_MAX_BATCH_ROWS]
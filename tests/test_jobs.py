@@ -0,0 +1,168 @@
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import ROOT
+
+def waitForJob(client, jobId, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get('/pattern/jobs/%s' % jobId).get_json()['job']
+        if job['status'] in ('done', 'failed'):
+            return job
+        time.sleep(0.05)
+    raise AssertionError('job %s did not finish' % jobId)
+
+# a separate interpreter stands in for another gunicorn worker: it shares nothing with this process but the database
+POLL = """
+import json, sys
+import app
+client = app.app.test_client()
+status = client.get('/pattern/jobs/%s' % sys.argv[1])
+result = client.get('/pattern/jobs/%s/result' % sys.argv[1])
+print(json.dumps({'status': status.status_code, 'job': status.get_json()['job'], 'result': result.status_code,
+                  'mimetype': result.mimetype, 'bytes': len(result.data)}))
+"""
+
+def pollElsewhere(jobId):
+    output = subprocess.run([sys.executable, '-c', POLL, jobId], cwd=ROOT, env=dict(os.environ), check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+def test_job_submitted_to_one_process_is_served_by_another(client):
+    response = client.post('/pattern/jobs', json={'person_id': 1, 'piece': 'mens/sloper/torso/front'})
+    assert response.status_code == 202
+    jobId = response.get_json()['job']['id']
+    job = waitForJob(client, jobId)
+    assert job['status'] == 'done'
+
+    polled = pollElsewhere(jobId)
+    assert polled['status'] == 200
+    assert polled['job'] == job
+    assert polled['result'] == 200
+    assert polled['mimetype'] == 'application/pdf'
+    assert polled['bytes'] == len(client.get('/pattern/jobs/%s/result' % jobId).data) > 0
+
+def test_queued_job_is_visible_to_another_process(app, client):
+    import patterns
+    with app.test_request_context():
+        jobs = patterns.DraftJobs(0, 10) # no worker threads, so the job stays queued
+        jobId = jobs.submit('womens/sloper/skirt/back', 2, 'native', 'svg')
+    polled = pollElsewhere(jobId)
+    assert polled['status'] == 200
+    assert polled['job']['status'] == 'queued'
+    assert polled['result'] == 409
+
+def test_finished_jobs_beyond_the_history_are_dropped(app, client):
+    import patterns
+    with app.test_request_context():
+        jobs = patterns.DraftJobs(0, 2)
+        jobIds = [jobs.submit('mens/sloper/sleeve', 1, 'native', 'svg') for _ in range(3)]
+    with app.app_context():
+        for _ in jobIds:
+            jobs.run(jobs.claim(jobs.queue.get()))
+        assert jobs.get(jobIds[0]) is None
+        assert [jobs.get(jobId).status for jobId in jobIds[1:]] == ['done', 'done']
+
+def test_jobs_run_from_a_process_queue(app, client):
+    import patterns
+    # items cross the queue pickled, as they would to another process
+    with app.test_request_context():
+        jobs = patterns.DraftJobs(0, 10, multiprocessing.get_context('spawn').Queue())
+        jobId = jobs.submit('womens/sloper/skirt/front', 2, 'native', 'svg')
+    with app.app_context():
+        jobs.run(jobs.claim(jobs.queue.get(timeout=10)))
+    job = client.get('/pattern/jobs/%s' % jobId).get_json()['job']
+    assert job['status'] == 'done'
+    assert client.get('/pattern/jobs/%s/result' % jobId).mimetype == 'image/svg+xml'
+
+def addJob(app, status, age, startedAge=None):
+    import models
+    now = datetime.utcnow()
+    with app.app_context():
+        job = models.DraftJob(id=os.urandom(16).hex(), status=status, piece='mens/sloper/torso/back', person_id=1,
+                              renderer='native', format='svg', created_at=now - timedelta(seconds=age),
+                              started_at=now - timedelta(seconds=startedAge) if startedAge is not None else None)
+        models.db.session.add(job)
+        models.db.session.commit()
+        return job.id
+
+def test_abandoned_jobs_are_taken_over(app, client):
+    import patterns
+    jobs = patterns.DraftJobs(0, 10, lease=60, timeout=3600)
+    with app.app_context():
+        # the worker holding these was killed: one never left the queue, one is past its lease
+        queued = addJob(app, 'queued', 120)
+        expired = addJob(app, 'running', 120, startedAge=90)
+        held = addJob(app, 'running', 120, startedAge=30)
+        claimed = []
+        job = jobs.claim()
+        while job is not None:
+            claimed.append(job.id)
+            jobs.run(job)
+            job = jobs.claim()
+        assert queued in claimed and expired in claimed and held not in claimed # earlier tests leave queued jobs too
+        assert jobs.claim(held) is None
+    statuses = [client.get('/pattern/jobs/%s' % jobId).get_json()['job']['status'] for jobId in (queued, expired, held)]
+    assert statuses == ['done', 'done', 'running']
+
+def test_a_job_is_claimed_once(app):
+    import patterns
+    jobs = patterns.DraftJobs(0, 10)
+    with app.app_context():
+        jobId = addJob(app, 'queued', 0)
+        assert jobs.claim(jobId).id == jobId
+        assert jobs.claim(jobId) is None
+
+def test_jobs_past_the_timeout_fail_when_polled(app, client):
+    import patterns
+    jobId = addJob(app, 'running', patterns.JOB_TIMEOUT + 60, startedAge=30)
+    job = client.get('/pattern/jobs/%s' % jobId).get_json()['job']
+    assert (job['status'], job['error']) == ('failed', 'job timed out')
+    response = client.get('/pattern/jobs/%s/result' % jobId)
+    assert response.status_code == 422
+    with app.app_context():
+        assert patterns.DraftJobs(0, 10).claim(jobId) is None
+
+class OneJob:
+    def __init__(self, jobId):
+        self.jobIds = [jobId]
+
+    def get(self, timeout=None):
+        if not self.jobIds:
+            raise StopJobs
+        return self.jobIds.pop()
+
+class StopJobs(BaseException):
+    pass
+
+def test_failures_are_logged(app, client, monkeypatch, caplog):
+    import patterns
+    def broken(*args):
+        raise RuntimeError('renderer crashed')
+    monkeypatch.setattr(patterns, 'renderDraft', broken)
+    jobs = patterns.DraftJobs(0, 10)
+    with app.app_context():
+        jobs.run(jobs.claim(addJob(app, 'queued', 0)))
+    assert 'renderer crashed' in caplog.text
+    caplog.clear()
+    monkeypatch.setattr(jobs, 'claim', broken)
+    jobs.app = app
+    jobs.queue = OneJob('unreachable')
+    with pytest.raises(StopJobs):
+        jobs.work() # stops once the queue is empty, rather than waiting for orphans
+    assert 'draft job unreachable could not be run' in caplog.text
+
+def test_person_id_must_be_an_integer(client):
+    response = client.post('/pattern/jobs', json={'person_id': True, 'piece': 'mens/sloper/torso/front'})
+    assert response.status_code == 400
+
+def test_unknown_job(client):
+    assert client.get('/pattern/jobs/missing').status_code == 404
+    assert client.get('/pattern/jobs/missing/result').status_code == 404
@@ -0,0 +1,19 @@
+import pytest
+
+MARKER = {'pieces': ['mens/sloper/sleeve'], 'fabric_width': 60, 'format': 'json'}
+
+def test_marker_places_every_piece(client):
+    response = client.post('/pattern/marker', json=dict(MARKER, person_ids=[1], quantity=2))
+    assert response.status_code == 200
+    assert len(response.get_json()['marker']['placements']) == 2
+
+@pytest.mark.parametrize('personIds', [[True], [1, False], [], [1.0], 1])
+def test_marker_person_ids_must_be_integers(client, personIds):
+    assert client.post('/pattern/marker', json=dict(MARKER, person_ids=personIds)).status_code == 400
+
+def test_marker_person_ids_are_capped(client, monkeypatch):
+    import patterns
+    monkeypatch.setattr(patterns, 'BATCH_MAX_PEOPLE', 2)
+    response = client.post('/pattern/marker', json=dict(MARKER, person_ids=[1, 1, 1]))
+    assert response.status_code == 400
+    assert response.get_json() == {'message': 'at most 2 person_ids per request'}
@@ -0,0 +1,22 @@
+import pytest
+
+UNDRAFTABLE = {'message': 'measurements cannot be drafted'}
+
+# person 1 has men's measurements, from which the women's skirt back divides by zero
+@pytest.mark.parametrize('url', ['/pattern/womens/sloper/skirt/back/1',
+                                 '/pattern/womens/sloper/skirt/back/1?renderer=native&format=svg',
+                                 '/pattern/womens/sloper/skirt/back/1/geometry',
+                                 '/pattern/womens/sloper/skirt/1'])
+def test_undraftable_measurements_are_422(client, url):
+    response = client.get(url)
+    assert response.status_code == 422
+    assert response.get_json() == UNDRAFTABLE
+
+def test_draftable_piece(client):
+    assert client.get('/pattern/womens/sloper/skirt/back/2').mimetype == 'application/pdf'
+    geometry = client.get('/pattern/womens/sloper/skirt/back/2/geometry').get_json()['geometry']
+    assert geometry['width'] > 0 and geometry['height'] > 0
+
+def test_missing_measurements_are_404(client):
+    assert client.get('/pattern/womens/sloper/skirt/back/99').status_code == 404
+    assert client.get('/pattern/womens/sloper/skirt/back/99/geometry').status_code == 404
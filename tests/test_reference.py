@@ -0,0 +1,28 @@
+import os
+import tempfile
+
+def loadReference(app, table, text):
+    path = os.path.join(tempfile.mkdtemp(), table + '.csv')
+    with open(path, 'w', encoding='utf-8') as csvFile:
+        csvFile.write(text)
+    return app.test_cli_runner().invoke(args=['load-reference', table, path])
+
+def continents(app):
+    import models
+    with app.app_context():
+        return dict(models.db.session.query(models.Continent.code, models.Continent.name))
+
+def test_the_last_row_for_a_key_wins(app):
+    result = loadReference(app, 'continent', 'code,name\nEU,Europe\nAF,Africa\nEU,Europa\n')
+    assert result.exit_code == 0, result.output
+    assert 'loaded 3 rows' in result.output
+    assert continents(app)['EU'] == 'Europa'
+
+def test_rows_with_the_wrong_number_of_fields_reject_the_file(app, monkeypatch):
+    import app as appmodule
+    monkeypatch.setattr(appmodule, 'REFERENCE_BATCH_ROWS', 1) # the first row is written before the bad ones are read
+    before = continents(app)
+    result = loadReference(app, 'continent', 'code,name\nAS,Asia\nOC\nSA,South America\nAN,Antarctica,extra\n')
+    assert result.exit_code == 1
+    assert 'expected 2 fields on line 3, 5; nothing was loaded' in result.output
+    assert continents(app) == before
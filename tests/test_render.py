@@ -0,0 +1,40 @@
+from concurrent.futures import Future
+
+import pytest
+
+class StuckPool:
+    # stands in for the render pool: its one render never finishes
+    def __init__(self, running):
+        self.future = Future()
+        if running:
+            self.future.set_running_or_notify_cancel()
+        self.shutDown = False
+
+    def submit(self, *args):
+        return self.future
+
+    def shutdown(self, wait=True):
+        self.shutDown = True
+
+@pytest.fixture
+def stuckPool(monkeypatch, request):
+    import patterns
+    pool = StuckPool(request.param)
+    monkeypatch.setattr(patterns, 'RENDER_WORKERS', 1)
+    monkeypatch.setattr(patterns, 'RENDER_TIMEOUT', 0.01)
+    monkeypatch.setattr(patterns, 'renderPool', pool)
+    monkeypatch.setattr(patterns.patternCache, 'get', lambda key: None)
+    return pool
+
+@pytest.mark.parametrize('stuckPool', [False, True], indirect=True, ids=['queued', 'running'])
+def test_render_timeout_is_504(client, stuckPool):
+    import patterns
+    response = client.get('/pattern/mens/sloper/torso/front/1')
+    assert response.status_code == 504
+    assert response.get_json() == {'message': 'rendering timed out'}
+    if stuckPool.future.running():
+        # the render holds its worker, so the pool is retired and the next request starts another
+        assert stuckPool.shutDown and patterns.renderPool is None
+    else:
+        assert stuckPool.future.cancelled()
+        assert not stuckPool.shutDown and patterns.renderPool is stuckPool